@@ -6,7 +6,6 @@ from pathlib import Path
 from typing import Optional
 
 from .profile_analyzer import ProfileAnalyzer
-from .visualizer import GraphVisualizer
 
 
 def get_default_input_dir() -> str:
@@ -20,6 +19,17 @@ def get_default_input_dir() -> str:
         return Path.home() / ".config" / "OrcaSlicer"
 
 
+def get_default_cache_dir() -> Path:
+    """Get the OS-specific directory for caching parsed profiles"""
+    system = platform.system()
+    if system == "Windows":
+        return Path.home() / "AppData" / "Local" / "orcaslicer-profile-explorer" / "Cache"
+    elif system == "Darwin":  # macOS
+        return Path.home() / "Library" / "Caches" / "orcaslicer-profile-explorer"
+    else:  # Linux and other Unix-like systems
+        return Path(os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache") / "orcaslicer-profile-explorer"
+
+
 @click.command()
 @click.option('--target', '-t', default=None, help='Target profile to visualize (shows parents and children)')
 @click.option('--output', '-o', default='orcaslicer_graph.dot', help='Output file for the graphviz dot file')
@@ -32,7 +42,10 @@ def get_default_input_dir() -> str:
 @click.option('--process', '-p', 'profile_types', flag_value='process', help='Show only process profiles')
 @click.option('--group', is_flag=True, help='Group nodes by directory hierarchy')
 @click.option('--simple', is_flag=True, help='Show only profile names without additional attributes')
-def main(target: Optional[str], output: str, input_dir: str, show_profile: Optional[str], show_effective_profile: tuple, user: bool, profile_types: str, group: bool, simple: bool):
+@click.option('--collapse-system', is_flag=True, help='Collapse system profiles ("from": "system") that are not ancestors of a non-system profile into summary nodes when the graph is larger than --max-nodes')
+@click.option('--max-nodes', default=500, show_default=True, help='Profile count above which --collapse-system collapses the graph')
+@click.option('--no-cache', is_flag=True, help='Parse every profile file instead of reusing parsed profiles cached by earlier runs')
+def main(target: Optional[str], output: str, input_dir: str, show_profile: Optional[str], show_effective_profile: tuple, user: bool, profile_types: str, group: bool, simple: bool, collapse_system: bool, max_nodes: int, no_cache: bool):
     """OrcaSlicer Profile Explorer - supports filament, machine, and process profiles"""
 
     # Use OS-specific default if input_dir is not provided
@@ -47,8 +60,11 @@ def main(target: Optional[str], output: str, input_dir: str, show_profile: Optio
     # Determine which profile types to load
     profile_type_list = [profile_types] if profile_types else ["filament", "machine", "process"]
 
-    # Create analyzer
-    analyzer = ProfileAnalyzer(input_dir)
+    # Create analyzer; settings of every loaded profile are only needed for the vendor labels
+    # of a full graph, so read them on demand otherwise
+    lazy_settings = simple or user or bool(target or show_profile or show_effective_profile)
+    cache_dir = None if no_cache else str(get_default_cache_dir())
+    analyzer = ProfileAnalyzer(input_dir, lazy_settings=lazy_settings, cache_dir=cache_dir)
     # Clear the default loading and load only requested profile types
     analyzer.profiles = {}
     analyzer.load_profiles_by_type(profile_type_list)
@@ -67,8 +83,13 @@ def main(target: Optional[str], output: str, input_dir: str, show_profile: Optio
 
     # Otherwise, generate the graph visualization
     try:
+        # Imported here so the settings tables don't pay for loading graphviz
+        from .visualizer import GraphVisualizer
+
         visualizer = GraphVisualizer(analyzer)
-        dot = visualizer.generate_graph(target, user_only=user, profile_types=profile_type_list, group=group, simple=simple)
+        # Only the DOT source is needed, so write its lines out without building a Digraph
+        dot_lines = visualizer.iter_dot_lines(target, user_only=user, profile_types=profile_type_list, group=group, simple=simple,
+                                              max_nodes=max_nodes if collapse_system else None)
         
         # Write to output file
         output_path = Path(output)
@@ -78,8 +99,12 @@ def main(target: Optional[str], output: str, input_dir: str, show_profile: Optio
         else:
             output_file = str(output_path)
 
-        # Save the dot file - graphviz save() will handle the file creation properly
-        dot.save(filename=output_file)
+        # Save the dot file, creating its directory if needed as graphviz save() did
+        output_dir = os.path.dirname(output_file)
+        if output_dir:
+            os.makedirs(output_dir, exist_ok=True)
+        with open(output_file, 'w', encoding='utf-8') as fh:
+            fh.writelines(dot_lines)
 
         # Print the actual file that was created
         actual_output_path = Path(output_file)
@@ -1,135 +1,542 @@
-import json
+import hashlib
+import itertools
+import operator
 import os
+import pickle
+import re
+import sys
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Dict, List, Optional, Set, Any
-from dataclasses import dataclass
+from typing import Dict, Iterator, List, Optional, Set, Any, Tuple
+from dataclasses import InitVar, dataclass, field
 
+try:
+    # orjson is an optional, faster drop-in for parsing profile files
+    from orjson import loads as _json_loads
+except ImportError:
+    from json import loads as _json_loads
 
-@dataclass
+
+# Top-level JSON keys that describe the profile itself rather than its settings
+_METADATA_KEYS = frozenset(('name', 'inherits', 'from', 'type'))
+
+# Version of the parsed profile cache format; bump it whenever the cached entries change shape
+_PROFILE_CACHE_VERSION = 1
+
+# Shared filament library that is preferred when a profile name is ambiguous
+_ORCA_FILAMENT_LIBRARY_PATH = 'system/OrcaFilamentLibrary'
+
+# Directory markers used to infer a profile's type from its location, in priority order
+# (uses OS-appropriate path separators)
+_PROFILE_TYPE_MARKERS = (
+    (os.sep + "process" + os.sep, 'process'),
+    (os.sep + "machine" + os.sep, 'machine'),
+    (os.sep + "filament" + os.sep, 'filament'),
+)
+
+
+def _infer_profile_type(path_str: str, default: str) -> str:
+    """Infer a profile type from the directory structure, falling back to the given default"""
+    for marker, profile_type in _PROFILE_TYPE_MARKERS:
+        if marker in path_str:
+            return profile_type
+    return default
+
+
+# Matches a '"type": "<value>"' member in raw profile JSON
+_TYPE_MEMBER_PATTERN = re.compile(rb'(?<!\\)"type"\s*:\s*"([^"\\]*)"')
+
+
+def _peek_profile_type(raw: bytes) -> Optional[str]:
+    """
+    Read the declared profile type from raw JSON bytes without parsing the whole file.
+
+    Only the text before the first nested '{' is searched, so any match is a top-level
+    member. Returns None when the type can't be determined this way.
+    """
+    start = raw.find(b'{')
+    if start == -1:
+        return None
+    nested = raw.find(b'{', start + 1)
+    head = raw[start:nested] if nested != -1 else raw[start:]
+
+    matches = _TYPE_MEMBER_PATTERN.findall(head)
+    if len(matches) != 1:
+        return None
+    try:
+        return matches[0].decode('ascii')
+    except UnicodeDecodeError:
+        return None
+
+
+def _filter_profile_type(profile_path: str, declared_type: str) -> str:
+    """Get the type used when loading by type; a default 'filament' type is refined from the directory"""
+    if declared_type == 'filament':
+        return _infer_profile_type(profile_path, declared_type)
+    return declared_type
+
+
+def _is_meaningful(value: Any) -> bool:
+    """Check whether a setting value is set to something that overrides an inherited value"""
+    if value is None or value == "":
+        return False
+    if isinstance(value, list):
+        return len(value) > 0 and not all((v == "" or v == "-" or v is None) for v in value)
+    if isinstance(value, str):
+        return bool(value.strip()) and value != "-"
+    return True
+
+
+def _is_summary_only_setting(setting_name: str) -> bool:
+    """Check whether a setting (gcode and filament notes) is only shown as SET or - in tables"""
+    lowered = setting_name.lower()
+    return 'gcode' in lowered or lowered == 'filament_notes'
+
+
+def _summary_value(settings: Dict[str, Any], setting_name: str) -> str:
+    """Show a summary-only setting as SET if the profile defines it with a non-empty value, otherwise -"""
+    if setting_name not in settings:
+        return "-"  # Setting not defined in this profile
+    actual_value = settings[setting_name]
+    if actual_value and isinstance(actual_value, str) and actual_value.strip():
+        return "SET"
+    elif isinstance(actual_value, list) and any(str(v).strip() for v in actual_value if isinstance(v, str)):
+        return "SET"
+    elif actual_value:  # Non-empty value that's not a string or list
+        return "SET"
+    return "-"  # Empty value
+
+
+def _format_comparison_value(value: Any) -> Any:
+    """Format a setting value for the settings comparison, showing lists comma-separated"""
+    if isinstance(value, list):
+        return ', '.join(str(v) for v in value)
+    return value
+
+
+def _format_effective_value(value: Any) -> Any:
+    """Format an effective setting value for display in a table"""
+    # Show single-element lists as their value and longer lists comma-separated
+    if isinstance(value, list):
+        if len(value) == 1:
+            value = value[0]
+        else:
+            value = ", ".join(str(v) for v in value)
+
+    # Convert empty values to "-", leaving "N/A" as is
+    if not value or (isinstance(value, str) and not value.strip()):
+        return "-"
+    return value
+
+
+def _effective_settings(chain: List["Profile"]) -> Dict[str, Any]:
+    """Resolve the effective settings of an inheritance chain ordered from specific to base"""
+    effective = {}
+    # Apply the chain from base to specific so more specific profiles override their parents,
+    # skipping values that don't provide a meaningful override
+    for profile in reversed(chain):
+        for setting_name, value in profile.settings.items():
+            if _is_meaningful(value):
+                effective[setting_name] = value
+    return effective
+
+
+def _intern(value: Any) -> Any:
+    """Intern string values so repeated names share one object and compare by identity"""
+    return sys.intern(value) if isinstance(value, str) else value
+
+
+def _common_prefix_length(parts_a: Tuple[str, ...], parts_b: Tuple[str, ...]) -> int:
+    """Count the leading path components two paths have in common"""
+    # Compare component pairs with C-level map/eq rather than a Python index loop
+    matches = list(map(operator.eq, parts_a, parts_b))
+    try:
+        return matches.index(False)
+    except ValueError:
+        return len(matches)
+
+
+def _read_json(profile_path) -> Any:
+    """Read and parse a JSON file as raw bytes"""
+    with open(profile_path, 'rb') as f:
+        return _json_loads(f.read())
+
+
+def _try_read_json(profile_path) -> Any:
+    """Read and parse a JSON file, returning None on failure so the caller can report it"""
+    try:
+        return _read_json(profile_path)
+    except Exception:
+        return None
+
+
+def _extract_settings(data: Dict[str, Any]) -> Dict[str, Any]:
+    """Drop the metadata keys and intern the setting names, which repeat across every profile"""
+    return {sys.intern(k): v for k, v in data.items() if k not in _METADATA_KEYS}
+
+
+def _is_parsed_files_cache(parsed_files: Any) -> bool:
+    """Check that unpickled cache contents map paths to (signature, parsed data) entries"""
+    return isinstance(parsed_files, dict) and all(
+        isinstance(entry, tuple) and len(entry) == 2 and isinstance(entry[0], tuple) and isinstance(entry[1], dict)
+        for entry in parsed_files.values())
+
+
+def _file_signature(profile_path: str) -> Optional[Tuple[int, int]]:
+    """Get the (modification time, size) of a file, used to tell whether a cached parse is stale"""
+    try:
+        stat_result = os.stat(profile_path)
+    except OSError:
+        return None
+    return stat_result.st_mtime_ns, stat_result.st_size
+
+
+def _is_of_types(profile_path: str, data: Dict[str, Any], profile_types: List[str]) -> bool:
+    """Check whether parsed profile data is one of the requested types"""
+    return _filter_profile_type(profile_path, data.get('type', 'filament')) in profile_types
+
+
+def _read_profile_of_types(profile_path: str, profile_types: List[str]) -> Any:
+    """Parse a profile file if it is one of the requested types, otherwise return None"""
+    try:
+        with open(profile_path, 'rb') as f:
+            raw = f.read()
+
+        # Reject files of other types from the raw bytes where possible, before a full parse
+        declared_type = _peek_profile_type(raw)
+        if declared_type is not None and _filter_profile_type(profile_path, declared_type) not in profile_types:
+            return None
+
+        data = _json_loads(raw)
+        return data if _is_of_types(profile_path, data, profile_types) else None
+    except Exception:
+        # If there's an error reading, just skip this file
+        return None
+
+
+@dataclass(slots=True)
 class Profile:
     name: str
     inherits: Optional[str]
     file_path: str
     from_system: bool
-    settings: Dict[str, Any]
+    # None defers reading the settings from file_path until they are first accessed
+    settings: InitVar[Optional[Dict[str, Any]]]
     profile_type: str = "filament"
+    _settings: Optional[Dict[str, Any]] = field(init=False, repr=False, compare=False)
+    # Path components cached once so lookups don't rebuild Path objects on every comparison
+    file_path_parts: Tuple[str, ...] = field(init=False, repr=False, compare=False)
+    parent_dir: str = field(init=False, repr=False, compare=False)
+    is_orca_filament_library: bool = field(init=False, repr=False, compare=False)
+    is_in_user_directory: bool = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self, settings: Optional[Dict[str, Any]]):
+        self._settings = settings
+        profile_path = Path(self.file_path)
+        self.file_path_parts = profile_path.parts
+        self.parent_dir = str(profile_path.parent)
+        normalized_path = self.file_path.replace(os.sep, '/')
+        self.is_orca_filament_library = _ORCA_FILAMENT_LIBRARY_PATH in normalized_path
+        self.is_in_user_directory = "user/" in normalized_path
+
+
+def _get_profile_settings(profile: Profile) -> Dict[str, Any]:
+    """Get the profile settings, reading them from the profile file on first access if deferred"""
+    if profile._settings is None:
+        data = _try_read_json(profile.file_path)
+        # Fall back to no settings if the file has become unreadable since it was loaded
+        profile._settings = _extract_settings(data) if isinstance(data, dict) else {}
+    return profile._settings
+
+
+def _set_profile_settings(profile: Profile, settings: Dict[str, Any]):
+    """Replace the profile settings"""
+    profile._settings = settings
+
+
+# Defined outside the class body so the dataclass keeps settings as an __init__ argument
+Profile.settings = property(_get_profile_settings, _set_profile_settings)
+
+
+def _get_directory_path(profile: Profile) -> str:
+    """Get the directory of a profile from the OrcaSlicer directory down, used to group graph nodes"""
+    full_path_parts = profile.file_path_parts
+    # Assuming the base path is up to the first major directory after OrcaSlicer
+    # Find where OrcaSlicer is in the path and take everything after
+    try:
+        base_index = full_path_parts.index('OrcaSlicer')
+    except ValueError:
+        base_index = -1
+
+    # Use the path starting after OrcaSlicer, excluding the filename
+    if base_index != -1:
+        return '/' + '/'.join(full_path_parts[base_index:-1])
+    # Fallback: just remove the file name
+    return '/'.join(full_path_parts[:-1])
 
 
 class ProfileAnalyzer:
-    def __init__(self, base_path: str):
+    def __init__(self, base_path: str, lazy_settings: bool = False, cache_dir: Optional[str] = None):
         self.base_path = Path(base_path)
+        # Only keep profile metadata when loading and read the settings when first needed
+        self.lazy_settings = lazy_settings
+        # Directory to keep parsed profile files in between runs, or None to always parse them
+        self.cache_dir = Path(cache_dir) if cache_dir else None
+        # Parsed profile files keyed by path, with the file signature they were parsed at;
+        # read from the cache directory while loading and dropped once the cache is saved
+        self._parsed_files: Optional[Dict[str, Tuple[Tuple[int, int], Dict[str, Any]]]] = None
         self.profiles: Dict[str, Profile] = {}
         # Keep track of duplicate profile names to handle conflicts
         self.profile_name_to_file_paths: Dict[str, List[str]] = {}
+        # Memoized get_profile results keyed by (name, requesting_file_path)
+        self._get_profile_cache: Dict[Tuple[str, Optional[str]], Optional[Profile]] = {}
+        # Profiles grouped by original name, built lazily from self.profiles
+        self._profiles_by_name: Optional[Dict[str, List[Profile]]] = None
+        # Profiles grouped by the name they inherit from, built lazily from self.profiles
+        self._children_by_parent: Optional[Dict[Optional[str], List[Profile]]] = None
+        # Profiles grouped by profile type, built lazily from self.profiles
+        self._profiles_by_type: Optional[Dict[str, List[Profile]]] = None
+        # Graph grouping directory paths keyed by profile file path, built lazily from self.profiles
+        self._profile_directories: Optional[Dict[str, str]] = None
+        # Inheritance chains keyed by the file path of the profile they start from
+        self._chain_cache: Dict[str, Tuple[Profile, ...]] = {}
+        # Descendant lists keyed by the parent profile name
+        self._descendants_cache: Dict[str, Tuple[Profile, ...]] = {}
+        # Sorted setting names keyed by the file paths of the profiles in a chain
+        self._sorted_settings_cache: Dict[frozenset, List[str]] = {}
         self.load_all_profiles()
+
+    def _clear_caches(self):
+        """Drop memoized lookups and indexes; called whenever the loaded profile set changes"""
+        self._get_profile_cache.clear()
+        self._profiles_by_name = None
+        self._children_by_parent = None
+        self._profiles_by_type = None
+        self._profile_directories = None
+        self._chain_cache.clear()
+        self._descendants_cache.clear()
+        self._sorted_settings_cache.clear()
+
+    def _get_profiles_by_name(self) -> Dict[str, List[Profile]]:
+        """Get the index of profiles keyed by their original (possibly duplicated) name"""
+        if self._profiles_by_name is None:
+            profiles_by_name: Dict[str, List[Profile]] = {}
+            for profile in self.profiles.values():
+                profiles_by_name.setdefault(profile.name, []).append(profile)
+            self._profiles_by_name = profiles_by_name
+        return self._profiles_by_name
+
+    def _get_children_by_parent(self) -> Dict[Optional[str], List[Profile]]:
+        """Get the index of profiles keyed by the parent name they inherit from"""
+        if self._children_by_parent is None:
+            children_by_parent: Dict[Optional[str], List[Profile]] = {}
+            for profile in self.profiles.values():
+                children_by_parent.setdefault(profile.inherits, []).append(profile)
+            self._children_by_parent = children_by_parent
+        return self._children_by_parent
+
+    def _get_profiles_by_type(self) -> Dict[str, List[Profile]]:
+        """Get the index of profiles keyed by profile type"""
+        if self._profiles_by_type is None:
+            profiles_by_type: Dict[str, List[Profile]] = {}
+            for profile in self.profiles.values():
+                profiles_by_type.setdefault(profile.profile_type, []).append(profile)
+            self._profiles_by_type = profiles_by_type
+        return self._profiles_by_type
     
     def load_all_profiles(self):
         """Load all profiles from system and user directories"""
-        profile_paths = []
+        self._clear_caches()
+        # The paths are needed again to register the results in order
+        profile_paths = list(self._iter_profile_files())
+        signatures = self._get_file_signatures(profile_paths)
+        cached = self._get_cached_profile_data(profile_paths, signatures)
 
-        # Add system profiles
-        system_path = self.base_path / "system"
-        if system_path.exists():
-            profile_paths.extend(self._find_profile_files(system_path))
+        # Read and parse the uncached files concurrently, but register them in order on this
+        # thread so duplicate-name handling stays deterministic
+        uncached_paths = [profile_path for profile_path, data in zip(profile_paths, cached) if data is None]
+        with ThreadPoolExecutor() as executor:
+            parsed = dict(zip(uncached_paths, executor.map(_try_read_json, uncached_paths)))
 
-        # Add user profiles
-        user_path = self.base_path / "user"
-        if user_path.exists():
-            profile_paths.extend(self._find_profile_files(user_path))
+        for profile_path, data in zip(profile_paths, cached):
+            self._load_profile(profile_path, parsed[profile_path] if data is None else data)
 
-        # Load all profile files
-        for profile_path in profile_paths:
-            self._load_profile(profile_path)
+        self._save_cached_profile_data(profile_paths, signatures, parsed)
 
     def load_profiles_by_type(self, profile_types: List[str]):
         """Load only profiles of specific types"""
-        profile_paths = []
+        self._clear_caches()
+        # The paths are needed again to register the results in order
+        profile_paths = list(self._iter_profile_files())
+        signatures = self._get_file_signatures(profile_paths)
+        cached = self._get_cached_profile_data(profile_paths, signatures)
+
+        # Parse the uncached files concurrently, then load the matching profiles in order on
+        # this thread, reusing the parsed data rather than reading each file a second time
+        uncached_paths = [profile_path for profile_path, data in zip(profile_paths, cached) if data is None]
+        with ThreadPoolExecutor() as executor:
+            parsed = dict(zip(uncached_paths, executor.map(_read_profile_of_types, uncached_paths, itertools.repeat(profile_types))))
+
+        for profile_path, data in zip(profile_paths, cached):
+            if data is None:
+                data = parsed[profile_path]
+            elif not _is_of_types(profile_path, data, profile_types):
+                continue
+            if data is not None:
+                self._load_profile(profile_path, data)
 
-        # Add system profiles
-        system_path = self.base_path / "system"
-        if system_path.exists():
-            profile_paths.extend(self._find_profile_files(system_path))
+        self._save_cached_profile_data(profile_paths, signatures, parsed)
 
-        # Add user profiles
-        user_path = self.base_path / "user"
-        if user_path.exists():
-            profile_paths.extend(self._find_profile_files(user_path))
+    def _get_cache_file(self) -> Path:
+        """Get the cache file for this input directory"""
+        base_key = hashlib.blake2b(str(self.base_path.resolve()).encode(), digest_size=8).hexdigest()
+        return self.cache_dir / f"profiles-v{_PROFILE_CACHE_VERSION}-{base_key}.pkl"
 
-        # Load only profiles matching the specified types
-        for profile_path in profile_paths:
+    def _get_parsed_files(self) -> Dict[str, Tuple[Tuple[int, int], Dict[str, Any]]]:
+        """Get the parsed profile files, reading them from the cache directory on first use"""
+        if self._parsed_files is None:
             try:
-                with open(profile_path, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
-
-                profile_type = data.get('type', 'filament')
-
-                # If type is default 'filament', try to infer from directory
-                if profile_type == 'filament':
-                    path_str = str(profile_path)
-                    # Use OS-appropriate path separators for checking
-                    process_path = os.path.sep + "process" + os.path.sep
-                    machine_path = os.path.sep + "machine" + os.path.sep
-                    filament_path = os.path.sep + "filament" + os.path.sep
-
-                    if process_path in path_str:
-                        profile_type = 'process'
-                    elif machine_path in path_str:
-                        profile_type = 'machine'
-                    elif filament_path in path_str:
-                        profile_type = 'filament'
-
-                if profile_type in profile_types:
-                    self._load_profile(profile_path)
+                with open(self._get_cache_file(), 'rb') as f:
+                    parsed_files = pickle.load(f)
             except Exception:
-                # If there's an error reading, just skip this file
-                continue
+                parsed_files = None
+            # A missing, unreadable or malformed cache just means parsing the files again
+            self._parsed_files = parsed_files if _is_parsed_files_cache(parsed_files) else {}
+        return self._parsed_files
+
+    def _get_file_signatures(self, profile_paths: List[str]) -> List[Optional[Tuple[int, int]]]:
+        """Get the signature of each profile file, skipping the stat calls when there is no cache"""
+        if self.cache_dir is None:
+            return [None] * len(profile_paths)
+        return [_file_signature(profile_path) for profile_path in profile_paths]
+
+    def _get_cached_profile_data(self, profile_paths: List[str], signatures: List[Optional[Tuple[int, int]]]) -> List[Any]:
+        """Get the cached parsed data for each profile file, or None where it must be (re)parsed"""
+        if self.cache_dir is None:
+            return [None] * len(profile_paths)
+
+        parsed_files = self._get_parsed_files()
+        cached = []
+        for profile_path, signature in zip(profile_paths, signatures):
+            entry = parsed_files.get(profile_path)
+            cached.append(entry[1] if entry is not None and signature is not None and entry[0] == signature else None)
+        return cached
+
+    def _save_cached_profile_data(self, profile_paths: List[str], signatures: List[Optional[Tuple[int, int]]], parsed: Dict[str, Any]):
+        """Add newly parsed profile files to the cache and write it if anything changed"""
+        if self.cache_dir is None:
+            return
+
+        parsed_files = self._get_parsed_files()
+        # Only hold the parsed files while loading; keeping them would hold a second copy of
+        # every profile's settings, even when settings are meant to be read lazily
+        self._parsed_files = None
+        current_paths = set(profile_paths)
+        changed = False
+        # Forget files that no longer exist
+        for profile_path in [path for path in parsed_files if path not in current_paths]:
+            del parsed_files[profile_path]
+            changed = True
+        # Only successfully parsed profiles are kept, so broken files are reported on every run
+        for profile_path, signature in zip(profile_paths, signatures):
+            data = parsed.get(profile_path)
+            if signature is not None and isinstance(data, dict):
+                parsed_files[profile_path] = (signature, data)
+                changed = True
+        if not changed:
+            return
+
+        cache_file = self._get_cache_file()
+        temp_file = cache_file.with_name(f"{cache_file.name}.{os.getpid()}.tmp")
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            with open(temp_file, 'wb') as f:
+                pickler = pickle.Pickler(f, protocol=pickle.HIGHEST_PROTOCOL)
+                # Parsed JSON has no cycles, so skip the memo that would otherwise track every
+                # object written and roughly double peak memory on large directories
+                pickler.fast = True
+                pickler.dump(parsed_files)
+            os.replace(temp_file, cache_file)
+        except OSError:
+            # The cache is only an optimization, so failing to write it is not an error
+            temp_file.unlink(missing_ok=True)
 
     def get_profiles_by_type(self, profile_type: str) -> List[Profile]:
         """Get all profiles of a specific type"""
-        return [p for p in self.profiles.values() if p.profile_type == profile_type]
+        return list(self._get_profiles_by_type().get(profile_type, []))
+
+    def get_profile_directories(self) -> Dict[str, str]:
+        """Get the directory path that groups each profile in graphs, keyed by profile file path"""
+        if self._profile_directories is None:
+            profile_directories: Dict[str, str] = {}
+            # Profiles from the same directory are usually consecutive, so reuse the last path
+            last_parent_dir = None
+            directory_path = None
+            for profile in self.profiles.values():
+                if profile.parent_dir != last_parent_dir:
+                    last_parent_dir = profile.parent_dir
+                    directory_path = _get_directory_path(profile)
+                profile_directories[profile.file_path] = directory_path
+            self._profile_directories = profile_directories
+        return self._profile_directories
     
-    def _find_profile_files(self, directory: Path) -> List[Path]:
+    def _iter_profile_files(self) -> Iterator[str]:
+        """Iterate over the JSON profile files in the system and then the user directory"""
+        system_path = self.base_path / "system"
+        user_path = self.base_path / "user"
+        return itertools.chain(
+            self._find_profile_files(system_path) if system_path.exists() else (),
+            self._find_profile_files(user_path) if user_path.exists() else (),
+        )
+
+    def _find_profile_files(self, directory: Path) -> Iterator[str]:
         """Find all JSON profile files in the directory tree"""
-        profile_files = []
-        for root, _, files in os.walk(directory):
-            for file in files:
-                if file.endswith('.json'):
-                    profile_files.append(Path(root) / file)
-        return profile_files
+        # Walk with os.scandir so file types come from the directory entries without extra
+        # stat calls; files are yielded before subdirectories, in the same order as os.walk
+        subdirectories = []
+        try:
+            entries = os.scandir(directory)
+        except OSError:
+            return
+
+        with entries:
+            for entry in entries:
+                try:
+                    is_dir = entry.is_dir()
+                except OSError:
+                    is_dir = False
+
+                if is_dir:
+                    # Like os.walk, don't follow symlinked directories
+                    if not entry.is_symlink():
+                        subdirectories.append(entry.path)
+                elif entry.name.endswith('.json'):
+                    yield entry.path
+
+        for subdirectory in subdirectories:
+            yield from self._find_profile_files(subdirectory)
     
-    def _load_profile(self, profile_path: Path):
-        """Load a profile from a JSON file"""
+    def _load_profile(self, profile_path: str, data: Any = None):
+        """Load a profile from a JSON file, or from its already parsed contents"""
         try:
-            with open(profile_path, 'r', encoding='utf-8') as f:
-                data = json.load(f)
+            if data is None:
+                # Files that failed to parse ahead of time are re-read here so the error is reported
+                data = _read_json(profile_path)
 
-            name = data.get('name')
+            name = _intern(data.get('name'))
             if name:
-                inherits = data.get('inherits')
+                inherits = _intern(data.get('inherits'))
                 from_system = data.get('from', '').lower() == 'system'
 
-                # Determine profile type from JSON data or directory structure
-                profile_type = data.get('type', 'filament')
-
-                # If type is default or if we should infer from directory, check the directory
-                path_str = str(profile_path)
-                # Use OS-appropriate path separators for checking
-                process_path = os.path.sep + "process" + os.path.sep
-                machine_path = os.path.sep + "machine" + os.path.sep
-                filament_path = os.path.sep + "filament" + os.path.sep
-
-                if process_path in path_str:
-                    profile_type = 'process'
-                elif machine_path in path_str:
-                    profile_type = 'machine'
-                elif filament_path in path_str:
-                    # Explicitly set to filament if in filament directory
-                    profile_type = 'filament'
+                # Determine profile type from directory structure, falling back to the JSON data
+                # (interned so type filters compare against the shared type strings by identity)
+                profile_type = _intern(_infer_profile_type(profile_path, data.get('type', 'filament')))
 
                 # Track file paths for each profile name to handle duplicates
                 if name not in self.profile_name_to_file_paths:
                     self.profile_name_to_file_paths[name] = []
-                self.profile_name_to_file_paths[name].append(str(profile_path))
+                self.profile_name_to_file_paths[name].append(profile_path)
 
                 # If there are multiple profiles with the same name, create unique identifiers
                 # but also maintain the original name relationship
@@ -137,33 +544,43 @@ class ProfileAnalyzer:
                 unique_name = original_name
                 if len(self.profile_name_to_file_paths[original_name]) > 1:
                     # When multiple profiles have the same name, append path info to make unique
-                    profile_dir = str(Path(profile_path).parent)
+                    profile_dir = os.path.dirname(profile_path)
                     dir_parts = profile_dir.split(os.path.sep)
                     unique_dir_part = "/".join(dir_parts[-2:]) if len(dir_parts) >= 2 else dir_parts[-1]
                     unique_name = f"{original_name} [{unique_dir_part}]"
 
+                settings = None if self.lazy_settings else _extract_settings(data)
+
                 self.profiles[unique_name] = Profile(
                     name=original_name,  # Keep original name for reference
                     inherits=inherits,
-                    file_path=str(profile_path),
+                    file_path=profile_path,
                     from_system=from_system,
-                    settings={k: v for k, v in data.items() if k not in ['name', 'inherits', 'from', 'type']},
+                    settings=settings,
                     profile_type=profile_type
                 )
+                self._clear_caches()
         except Exception as e:
             print(f"Error loading profile {profile_path}: {e}")
     
     def get_profile(self, name: str, requesting_file_path: str = None) -> Optional[Profile]:
         """Get a profile by name, with optional requesting file path for disambiguation"""
+        cache_key = (name, requesting_file_path)
+        if cache_key in self._get_profile_cache:
+            return self._get_profile_cache[cache_key]
+
+        profile = self._lookup_profile(name, requesting_file_path)
+        self._get_profile_cache[cache_key] = profile
+        return profile
+
+    def _lookup_profile(self, name: str, requesting_file_path: Optional[str]) -> Optional[Profile]:
+        """Resolve a profile by name without consulting the lookup cache"""
 
         # First, try to get by exact key name (may be unique or with path suffix)
         exact_match = self.profiles.get(name)
 
         # Find all profiles with the same original name for potential disambiguation
-        profile_candidates = []
-        for profile_key, profile_obj in self.profiles.items():
-            if profile_obj.name == name:  # This looks for original name in the profile's name attribute
-                profile_candidates.append(profile_obj)
+        profile_candidates = self._get_profiles_by_name().get(name, [])
 
         # If no profiles with the requested name exist, return None
         if not profile_candidates:
@@ -176,11 +593,11 @@ class ProfileAnalyzer:
         # If multiple profiles exist with the same original name, apply heuristics
         # This will be the case when we need to disambiguate based on directory proximity
         if requesting_file_path:
-            requesting_path_obj = Path(requesting_file_path)
-            requesting_parts = requesting_path_obj.parts
-
             # Find the closest matching profile based on directory proximity
-            closest_candidate = self._find_closest_profile(profile_candidates, requesting_path_obj)
+            requesting_path_obj = Path(requesting_file_path)
+            closest_candidate = self._find_closest_profile(
+                profile_candidates, requesting_path_obj.parts, str(requesting_path_obj.parent)
+            )
 
             if closest_candidate:
                 return closest_candidate
@@ -188,10 +605,7 @@ class ProfileAnalyzer:
         # If no specific file context provided, or no close match found,
         # prefer profiles in system/OrcaFilamentLibrary before others
         orca_filament_library_candidates = [
-            candidate for candidate in profile_candidates
-            if 'system/OrcaFilamentLibrary' in candidate.file_path or
-               '/system/OrcaFilamentLibrary' in candidate.file_path or
-               candidate.file_path.startswith('system/OrcaFilamentLibrary')
+            candidate for candidate in profile_candidates if candidate.is_orca_filament_library
         ]
 
         if orca_filament_library_candidates:
@@ -200,7 +614,7 @@ class ProfileAnalyzer:
         # If no OrcaFilamentLibrary profiles, return the first one as a fallback
         return profile_candidates[0]
 
-    def _find_closest_profile(self, candidates: List[Profile], requesting_path: Path) -> Optional[Profile]:
+    def _find_closest_profile(self, candidates: List[Profile], requesting_parts: Tuple[str, ...], requesting_parent_dir: str) -> Optional[Profile]:
         """Find the closest profile based on directory hierarchy proximity
 
         Implements the heuristic:
@@ -209,33 +623,23 @@ class ProfileAnalyzer:
         3. If no path matches, prefer profiles in system/OrcaFilamentLibrary
         4. As a last resort, return the first available profile
         """
-        requesting_path_obj = Path(requesting_path)
-        requesting_parent_dir = requesting_path_obj.parent
-        requesting_parts = requesting_path_obj.parts
+        # A single candidate is always the closest one
+        if len(candidates) == 1:
+            return candidates[0]
 
         # First, check for profiles in the exact same parent directory
         for candidate in candidates:
-            candidate_path = Path(candidate.file_path)
-            candidate_parent_dir = candidate_path.parent
-            if candidate_parent_dir == requesting_parent_dir:
+            if candidate.parent_dir == requesting_parent_dir:
                 return candidate
 
         # Then look for profiles in the same vendor/manufacturer directory or with the most common path
         closest_matches = []
 
         for candidate in candidates:
-            candidate_path = Path(candidate.file_path)
-            candidate_parts = candidate_path.parts
+            candidate_parts = candidate.file_path_parts
 
             # Find the common path length between requesting file and candidate file
-            common_length = 0
-            min_len = min(len(requesting_parts), len(candidate_parts))
-
-            for i in range(min_len):
-                if requesting_parts[i] == candidate_parts[i]:
-                    common_length += 1
-                else:
-                    break
+            common_length = _common_prefix_length(requesting_parts, candidate_parts)
 
             if common_length > 0:  # At least some common path
                 closest_matches.append((candidate, common_length))
@@ -248,10 +652,7 @@ class ProfileAnalyzer:
         # If no candidates share any path components with the requesting file,
         # look for candidates in system/OrcaFilamentLibrary as a fallback
         orca_filament_library_candidates = [
-            candidate for candidate in candidates
-            if 'system/OrcaFilamentLibrary' in candidate.file_path or
-               '/system/OrcaFilamentLibrary' in candidate.file_path or
-               candidate.file_path.startswith('system/OrcaFilamentLibrary')
+            candidate for candidate in candidates if candidate.is_orca_filament_library
         ]
 
         if orca_filament_library_candidates:
@@ -266,110 +667,155 @@ class ProfileAnalyzer:
     
     def get_profile_inheritance_chain(self, profile_name: str) -> List[Profile]:
         """Get the inheritance chain for a given profile name"""
-        chain = []
+        profile = self.get_profile(profile_name) if profile_name else None
+        if not profile:
+            return []
+        # Return a fresh list so callers can reorder it without touching the cached chain
+        return list(self._get_chain_from(profile))
+
+    def _get_chain_from(self, profile: Profile) -> Tuple[Profile, ...]:
+        """Get the inheritance chain starting at a resolved profile, reusing cached ancestor chains"""
+        chain = self._chain_cache.get(profile.file_path)
+        if chain is not None:
+            return chain
+
+        walked = []
         visited = set()
-
-        current_name = profile_name
-        requesting_file_path = None  # Will be set after we get the first profile
-        while current_name and current_name not in visited:
-            profile = self.get_profile(current_name, requesting_file_path)
-            if not profile:
+        ancestors: Tuple[Profile, ...] = ()
+        # Whether the walk ended without stopping at an already visited name, in which case
+        # every intermediate profile's chain is a suffix of this one
+        unique_names = True
+
+        current = profile
+        while True:
+            walked.append(current)
+            visited.add(current.name)
+            parent_name = current.inherits
+            if not parent_name:
+                break
+            if parent_name in visited:
+                unique_names = False
                 break
 
-            chain.append(profile)
-            visited.add(current_name)
-            requesting_file_path = profile.file_path  # Use this profile's path for subsequent lookups
-            current_name = profile.inherits
+            # Use this profile's path to disambiguate the parent lookup
+            parent = self.get_profile(parent_name, current.file_path)
+            if not parent:
+                break
 
+            cached = self._chain_cache.get(parent.file_path)
+            if cached is not None:
+                # Splice in the parent's chain, stopping where the walk would revisit a name
+                ancestors = cached
+                for i, ancestor in enumerate(cached):
+                    if ancestor.name in visited:
+                        ancestors = cached[:i]
+                        unique_names = False
+                        break
+                break
+            current = parent
+
+        chain = tuple(walked) + ancestors
+        if unique_names:
+            for i, walked_profile in enumerate(walked):
+                self._chain_cache[walked_profile.file_path] = chain[i:]
+        else:
+            self._chain_cache[profile.file_path] = chain
         return chain
     
     def get_all_children(self, parent_name: str) -> List[Profile]:
         """Get all profiles that inherit from the given profile"""
-        children = []
-        for profile in self.profiles.values():
-            if profile.inherits == parent_name:
-                children.append(profile)
-        return children
+        return list(self._get_children_by_parent().get(parent_name, []))
     
     def get_all_descendants(self, parent_name: str) -> List[Profile]:
         """Get all profiles that inherit (directly or indirectly) from the given profile"""
+        descendants = self._descendants_cache.get(parent_name)
+        if descendants is None:
+            descendants = self._walk_descendants(parent_name)
+            self._descendants_cache[parent_name] = descendants
+        # Return a fresh list so callers can extend it without touching the cached result
+        return list(descendants)
+
+    def _walk_descendants(self, parent_name: str) -> Tuple[Profile, ...]:
+        """Breadth-first search for descendants of a profile name, without consulting the cache"""
         descendants = []
-        to_check = [parent_name]
+        # Track descendants by file path for O(1) membership instead of scanning the list
+        seen_paths = set()
+        to_check = deque([parent_name])
         visited = set()
+        children_by_parent = self._get_children_by_parent()
 
         while to_check:
-            current_name = to_check.pop(0)
+            current_name = to_check.popleft()
             if current_name in visited:
                 continue
 
             visited.add(current_name)
-            children = self.get_all_children(current_name)
-
-            for child in children:
-                if child not in descendants:
+            for child in children_by_parent.get(current_name, ()):
+                if child.file_path not in seen_paths:
+                    seen_paths.add(child.file_path)
                     descendants.append(child)
                     to_check.append(child.name)
 
-        return descendants
+        return tuple(descendants)
 
     def get_branches_with_user_profiles(self, profile_types: List[str] = ["filament"]) -> List[Profile]:
         """Get all profiles that are part of branches containing user-defined profiles, filtered by profile types"""
-        user_profiles = [p for p in self.profiles.values() if not p.from_system and p.profile_type in profile_types]
+        user_profile_names = {p.name for p in self.profiles.values() if not p.from_system and p.profile_type in profile_types}
         all_relevant_profiles = set()
 
         # For each user profile, add the entire inheritance chain to the relevant set
-        for user_profile in user_profiles:
-            chain = self.get_profile_inheritance_chain(user_profile.name)
-            for profile in chain:
+        for user_profile_name in user_profile_names:
+            for profile in self.get_profile_inheritance_chain(user_profile_name):
                 # Only add profiles that are in the requested types
                 if profile.profile_type in profile_types:
-                    # Use the profile's unique key to store it
                     all_relevant_profiles.add(profile.name)
 
-        # Also add all descendants of user profiles and their ancestors
-        for user_profile in user_profiles:
-            # Add all descendants of this user profile
-            descendants = self.get_all_descendants(user_profile.name)
-            for descendant in descendants:
-                # Only add profiles that are in the requested types
-                if descendant.profile_type in profile_types:
-                    all_relevant_profiles.add(descendant.name)
-
-        # Return the profile objects (need to get them by name from the profiles dictionary)
-        result = []
-        for name in all_relevant_profiles:
-            # Look for profiles with this original name
-            found_profiles = [p for p in self.profiles.values() if p.name == name]
-            result.extend(found_profiles)
+        # Also add all descendants of user profiles, using a single breadth-first walk seeded
+        # with every user profile so shared subtrees are only traversed once
+        children_by_parent = self._get_children_by_parent()
+        to_check = deque(user_profile_names)
+        visited = set()
+        while to_check:
+            current_name = to_check.popleft()
+            if current_name in visited:
+                continue
 
-        return result
+            visited.add(current_name)
+            for child in children_by_parent.get(current_name, ()):
+                # Only add profiles that are in the requested types, but keep walking through the others
+                if child.profile_type in profile_types:
+                    all_relevant_profiles.add(child.name)
+                to_check.append(child.name)
+
+        # Return every profile with a relevant name, in load order
+        return [p for p in self.profiles.values() if p.name in all_relevant_profiles]
     
     def get_profile_settings_comparison(self, profile_name: str) -> Dict[str, List]:
         """Get a comparison of settings across the inheritance chain"""
         chain = self.get_profile_inheritance_chain(profile_name)
         # Reverse the chain so it shows from base to specific (left to right as requested)
         chain.reverse()
-        all_settings = set()
-
-        # Collect all possible settings
+        return self._settings_comparison(chain)
+
+    def _get_sorted_setting_names(self, chain: List[Profile]) -> List[str]:
+        """Get the sorted names of all settings defined anywhere in an inheritance chain"""
+        key = frozenset(profile.file_path for profile in chain)
+        setting_names = self._sorted_settings_cache.get(key)
+        if setting_names is None:
+            setting_names = sorted(set().union(*(profile.settings.keys() for profile in chain)))
+            self._sorted_settings_cache[key] = setting_names
+        return setting_names
+
+    def _settings_comparison(self, chain: List[Profile]) -> Dict[str, List]:
+        """Build the settings comparison for an inheritance chain ordered from base to specific"""
+        # Build the comparison table, starting with the sorted setting names
+        setting_names = list(self._get_sorted_setting_names(chain))
+        comparison = {'setting_names': setting_names}
+
+        # Build each profile's column in one pass over the setting names
         for profile in chain:
-            all_settings.update(profile.settings.keys())
-
-        # Build the comparison table
-        comparison = {'setting_names': []}
-        for profile in chain:
-            comparison[profile.name] = []
-
-        # Add parent names to the comparison
-        comparison['setting_names'] = sorted(list(all_settings))
-
-        for setting_name in comparison['setting_names']:
-            for profile in chain:
-                value = profile.settings.get(setting_name, "N/A")
-                # Convert lists to comma-separated strings for display
-                if isinstance(value, list):
-                    value = ', '.join(str(v) for v in value)
-                comparison[profile.name].append(value)
+            settings = profile.settings
+            comparison[profile.name] = [_format_comparison_value(settings.get(setting_name, "N/A")) for setting_name in setting_names]
 
         return comparison
 
@@ -379,7 +825,8 @@ class ProfileAnalyzer:
         chain = self.get_profile_inheritance_chain(profile_name)
         chain.reverse()  # Reverse the chain so it shows from base to specific (left to right as requested)
 
-        comparison = self.get_profile_settings_comparison(profile_name)
+        comparison = self._settings_comparison(chain)
+        chain_by_name = {p.name: p for p in chain}
 
         if not comparison or len(comparison) <= 1:  # Only has setting_names, no actual profiles
             return f"Profile '{profile_name}' not found or has no inheritance chain"
@@ -396,36 +843,29 @@ class ProfileAnalyzer:
 
         rows = [header, separator]
 
-        # Add each setting as a row
-        for i, setting_name in enumerate(comparison['setting_names']):
-            row = f"| {setting_name} |"
-            for profile_name_col in profile_names:
-                value = comparison[profile_name_col][i] if i < len(comparison[profile_name_col]) else "-"
+        # Every profile column has one value per setting name, so walk them together by row
+        columns = [comparison[profile_name_col] for profile_name_col in profile_names]
+        column_profiles = [chain_by_name.get(profile_name_col) for profile_name_col in profile_names]
 
+        # Add each setting as a row
+        for setting_name, *values in zip(comparison['setting_names'], *columns):
+            # Collect the cells and join them once rather than growing the row string per column
+            row_parts = ["|", setting_name, "|"]
+            # Classify the setting once per row rather than once per profile column
+            summary_only = _is_summary_only_setting(setting_name)
+            for prof, value in zip(column_profiles, values):
                 # For gcode and filament_notes settings, just indicate if value is set or not
-                if 'gcode' in setting_name.lower() or setting_name.lower() == 'filament_notes':
+                if summary_only:
                     # Only mark as SET if the profile actually defines this setting and has a non-empty value
-                    # Find the profile in the chain to check if setting is actually defined there
-                    prof = next((p for p in chain if p.name == profile_name_col), None)
-                    if prof and setting_name in prof.settings:
-                        actual_value = prof.settings.get(setting_name)
-                        if actual_value and isinstance(actual_value, str) and actual_value.strip():
-                            value = "SET"
-                        elif isinstance(actual_value, list) and any(str(v).strip() for v in actual_value if isinstance(v, str)):
-                            value = "SET"
-                        elif actual_value:  # Non-empty value that's not a string or list
-                            value = "SET"
-                        else:
-                            value = "-"  # Empty value
-                    else:
-                        value = "-"  # Setting not defined in this profile
-                else:
+                    # using the profile in the chain for this column
+                    value = _summary_value(prof.settings, setting_name) if prof else "-"
+                elif value == "N/A":
                     # Replace N/A with - for non-gcode and non-filament_notes settings
-                    if value == "N/A":
-                        value = "-"
+                    value = "-"
 
-                row += f" {value} |"
-            rows.append(row)
+                row_parts.append(str(value))
+                row_parts.append("|")
+            rows.append(" ".join(row_parts))
 
         return "\n".join(rows)
 
@@ -449,42 +889,14 @@ class ProfileAnalyzer:
         if len(profile_types) > 1:
             return f"All profiles must be of the same type. Found types: {', '.join(profile_types)}"
 
-        # Get all unique setting names across the inheritance chains of all requested profiles
+        # Get all unique setting names across the inheritance chains of all requested profiles,
+        # and resolve each profile's effective settings in a single pass over its chain
         all_setting_names = set()
-        all_chains = []
+        effective_settings = []
         for profile in profiles:
             chain = self.get_profile_inheritance_chain_with_types(profile.name)
-            all_chains.append(chain)
-            for chain_profile in chain:
-                all_setting_names.update(chain_profile.settings.keys())
-
-        # For each setting and each profile, find the effective value
-        effective_values = {}
-        for setting_name in all_setting_names:
-            effective_values[setting_name] = {}
-            for profile, chain in zip(profiles, all_chains):
-                # Find the effective value for this setting in this profile's chain
-                # Process from base to target (first to last in the chain) allowing child profiles to override parent values
-                value_found = "-"
-                for chain_profile in chain:  # Start with base profile and move to target
-                    if setting_name in chain_profile.settings:
-                        value = chain_profile.settings[setting_name]
-                        # Update the value if this profile provides a meaningful value
-                        is_meaningful = False
-                        if value is not None and value != "":
-                            if isinstance(value, list):
-                                if len(value) > 0 and not all((v == "" or v == "-" or v is None) for v in value):
-                                    is_meaningful = True
-                            elif isinstance(value, str):
-                                if value.strip() and value != "-":
-                                    is_meaningful = True
-                            else:
-                                is_meaningful = True
-
-                        if is_meaningful:
-                            value_found = value
-                            # Don't break - continue to allow more specific profiles to override
-                effective_values[setting_name][profile.name] = value_found
+            all_setting_names.update(self._get_sorted_setting_names(chain))
+            effective_settings.append(_effective_settings(chain))
 
         # Format as a markdown table with a column for each profile
         header = "| Setting Name | " + " | ".join(p.name for p in profiles) + " |"
@@ -493,43 +905,27 @@ class ProfileAnalyzer:
         rows = [header, separator]
 
         # Sort the setting names for consistent output
-        sorted_settings = sorted(effective_values.keys())
+        sorted_settings = sorted(all_setting_names)
 
         for setting_name in sorted_settings:
-            row = f"| {setting_name} |"
-            for profile in profiles:
+            # Collect the cells and join them once rather than growing the row string per column
+            row_parts = ["|", setting_name, "|"]
+            # Classify the setting once per row rather than once per profile column
+            summary_only = _is_summary_only_setting(setting_name)
+            for profile, effective in zip(profiles, effective_settings):
                 # For gcode and filament_notes, just show SET if the profile defines this setting, otherwise -
-                if 'gcode' in setting_name.lower() or setting_name.lower() == 'filament_notes':
+                if summary_only:
                     # Check if this specific profile defines the setting
-                    if setting_name in profile.settings:
-                        actual_value = profile.settings.get(setting_name)
-                        if actual_value and isinstance(actual_value, str) and actual_value.strip():
-                            value = "SET"
-                        elif isinstance(actual_value, list) and any(str(v).strip() for v in actual_value if isinstance(v, str)):
-                            value = "SET"
-                        elif actual_value:  # Non-empty value that's not a string or list
-                            value = "SET"
-                        else:
-                            value = "-"  # Empty value
-                    else:
-                        value = "-"  # Setting not defined in this profile
+                    value = _summary_value(profile.settings, setting_name)
                 else:
                     # For other settings, use the effective value (original logic)
-                    value = effective_values[setting_name][profile.name]
+                    value = effective.get(setting_name, "-")
 
-                    # Format the value appropriately
-                    if isinstance(value, list):
-                        if len(value) == 1:
-                            value = value[0]
-                        else:
-                            value = ", ".join(str(v) for v in value)
+                    value = _format_effective_value(value)
 
-                    # Convert empty values to "-", leaving "N/A" as is
-                    if not value or (isinstance(value, str) and not value.strip()) or value == "-":
-                        value = "-"
-
-                row += f" {value} |"
-            rows.append(row)
+                row_parts.append(str(value))
+                row_parts.append("|")
+            rows.append(" ".join(row_parts))
 
         return "\n".join(rows)
 
@@ -537,22 +933,7 @@ class ProfileAnalyzer:
         """
         Get the inheritance chain for a given profile name, regardless of profile type
         """
-        chain = []
-        visited = set()
-
-        current_name = profile_name
-        requesting_file_path = None  # Will be set after we get the first profile
-        while current_name and current_name not in visited:
-            profile = self.get_profile(current_name, requesting_file_path)
-            if not profile:
-                break
-
-            chain.append(profile)
-            visited.add(current_name)
-            requesting_file_path = profile.file_path  # Use this profile's path for subsequent lookups
-            current_name = profile.inherits
-
-        return chain
+        return self.get_profile_inheritance_chain(profile_name)
 
     def get_effective_profile_settings(self, profile_name: str) -> str:
         """
@@ -569,10 +950,9 @@ class ProfileAnalyzer:
         if not target_profile:
             return f"Profile '{profile_name}' not found"
 
-        # Collect all unique settings names across the entire chain
-        all_setting_names = set()
-        for profile in chain:
-            all_setting_names.update(profile.settings.keys())
+
+        # Resolve the effective value of every setting in a single pass over the chain
+        effective = _effective_settings(chain)
 
         # Format as a markdown table
         header = f"| Setting Name | {target_profile.name} |"
@@ -580,59 +960,18 @@ class ProfileAnalyzer:
 
         rows = [header, separator]
 
-        # Sort the setting names for consistent output
-        sorted_settings = sorted(all_setting_names)
+        # Get the sorted names of all settings across the entire chain
+        sorted_settings = self._get_sorted_setting_names(chain)
 
         for setting_name in sorted_settings:
             # For gcode and filament_notes, just show SET if the target profile defines this setting, otherwise -
-            if 'gcode' in setting_name.lower() or setting_name.lower() == 'filament_notes':
-                if setting_name in target_profile.settings:
-                    actual_value = target_profile.settings.get(setting_name)
-                    if actual_value and isinstance(actual_value, str) and actual_value.strip():
-                        value = "SET"
-                    elif isinstance(actual_value, list) and any(str(v).strip() for v in actual_value if isinstance(v, str)):
-                        value = "SET"
-                    elif actual_value:  # Non-empty value that's not a string or list
-                        value = "SET"
-                    else:
-                        value = "-"  # Empty value
-                else:
-                    value = "-"  # Setting not defined in this profile
+            if _is_summary_only_setting(setting_name):
+                value = _summary_value(target_profile.settings, setting_name)
             else:
                 # For other settings, use the effective value (original logic)
-                effective_value = "-"
-                # Walk through the chain from base to target (reversed order) to apply overrides in the right order
-                # The chain is originally [specific, parent, grandparent, ... base], so we need to reverse it
-                for profile in reversed(chain):  # Start with base profile and move to target
-                    if setting_name in profile.settings:
-                        profile_value = profile.settings[setting_name]
-                        # Update the value if this profile provides a meaningful value
-                        is_meaningful = False
-                        if profile_value is not None and profile_value != "":
-                            if isinstance(profile_value, list):
-                                if len(profile_value) > 0 and not all((v == "" or v == "-" or v is None) for v in profile_value):
-                                    is_meaningful = True
-                            elif isinstance(profile_value, str):
-                                if profile_value.strip() and profile_value != "-":
-                                    is_meaningful = True
-                            else:
-                                is_meaningful = True
-
-                            if is_meaningful:
-                                effective_value = profile_value
-                                # Don't break here - continue to allow more specific profiles to override
-                value = effective_value
-
-                # Format the value appropriately
-                if isinstance(value, list):
-                    if len(value) == 1:
-                        value = value[0]
-                    else:
-                        value = ", ".join(str(v) for v in value)
-
-                # Convert empty values to "-", leaving "N/A" as is
-                if not value or (isinstance(value, str) and not value.strip()):
-                    value = "-"
+                value = effective.get(setting_name, "-")
+
+                value = _format_effective_value(value)
 
             row = f"| {setting_name} | {value} |"
             rows.append(row)
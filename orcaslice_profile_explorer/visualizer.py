@@ -1,29 +1,185 @@
 import graphviz
-import os
+from graphviz.quoting import a_list, attr_list, quote, quote_edge
+import itertools
+from collections import defaultdict
 from pathlib import Path
-from typing import List, Optional
+from typing import Dict, Iterator, List, Optional, Tuple
 from .profile_analyzer import Profile, ProfileAnalyzer
 
 
+# Node (border color, system fill color, user fill color) based on the OrcaSlicer application
+# theme, keyed by profile type. Fills use transparency: 33 = ~20% for system (lighter),
+# 80 = ~50% for user (darker)
+_PROFILE_TYPE_STYLES = {
+    "filament": ('#2E86AB', '#2E86AB33', '#2E86AB80'),  # Darker blue for filament type
+    "machine": ('#27AE60', '#27AE6033', '#27AE6080'),  # Darker green for machine type
+    "process": ('#8E44AD', '#8E44AD33', '#8E44AD80'),  # Dark purple for process type
+}
+# Gray for other types
+_DEFAULT_PROFILE_STYLE = ('#7F8C8D', '#7F8C8D33', '#7F8C8D80')
+
+
+def _format_node_attributes(color: str, fillcolor: str, penwidth: str) -> str:
+    """Format the DOT attributes that follow a node label, in the sorted order graphviz uses"""
+    return f"color={quote(color)} fillcolor={quote(fillcolor)} penwidth={quote(penwidth)} shape=box style={quote('rounded,filled')}"
+
+
+def _format_style_attributes(style: Tuple[str, str, str]) -> Tuple[str, str]:
+    """Format the (system, user) node attributes for a profile type style"""
+    color, system_fillcolor, user_fillcolor = style
+    # Apply thicker border for user profiles (under user directory)
+    return _format_node_attributes(color, system_fillcolor, '1'), _format_node_attributes(color, user_fillcolor, '3')
+
+
+# Formatted (system, user) node attributes keyed by profile type
+_PROFILE_TYPE_NODE_ATTRIBUTES = {profile_type: _format_style_attributes(style) for profile_type, style in _PROFILE_TYPE_STYLES.items()}
+_DEFAULT_NODE_ATTRIBUTES = _format_style_attributes(_DEFAULT_PROFILE_STYLE)
+
+# Comment heading the DOT source, and the graph and default node attribute lines starting every graph body
+_GRAPH_COMMENT = 'OrcaSlicer Profile Inheritance'
+_GRAPH_HEADER_LINES = (
+    f"\t{a_list(kwargs={'rankdir': 'LR', 'size': '12,10'})}\n",
+    f"\tnode{attr_list(kwargs={'shape': 'box', 'style': 'rounded,filled', 'fontname': 'Arial'})}\n",
+)
+# Attributes of the directory cluster subgraphs
+_CLUSTER_ATTRIBUTES = a_list(kwargs={'style': 'bold', 'color': 'lightgrey', 'penwidth': '2'})
+
+# Directories that the grouped cluster hierarchy starts from
+_GROUP_ROOTS = frozenset(('system', 'user'))
+
+# Characters replaced or removed to turn a directory path into a cluster subgraph name
+_SUBGRAPH_NAME_TRANSLATION = str.maketrans({'/': '_', '-': '_', ' ': '_', '(': None, ')': None})
+
+
+def _get_node_label(profile: Profile, group: bool, simple: bool, input_dir_name: Optional[str]) -> str:
+    """Build the quoted label for a profile node with the profile name and key information"""
+    # Labels have at most four lines, so concatenate them directly rather than joining a list
+    label = profile.name  # Profile name without bolding
+
+    # Add additional information only if not in simple mode
+    if not simple:
+        # Add vendor if available
+        vendor = profile.settings.get('filament_vendor')
+        if vendor and isinstance(vendor, list) and len(vendor) > 0:
+            label += rf"\nVendor: {vendor[0]}"
+
+        # Get just the filename without the parent directory, from the cached path components
+        label += rf"\nFile: {profile.file_path_parts[-1]}"
+
+        # Add the path within the input directory when not using group option
+        if not group:
+            # Extract the path relative to the input directory
+            # Find the input directory in the path and get everything after it
+            path_parts = profile.file_path_parts
+            try:
+                input_dir_idx = path_parts.index(input_dir_name)
+            except ValueError:
+                input_dir_idx = -1
+
+            if input_dir_idx >= 0:
+                # Get everything after the input directory name
+                relative_path_parts = path_parts[input_dir_idx + 1:]  # Skip input directory itself
+                if len(relative_path_parts) > 1:  # If we have subdirectories
+                    # Join all parts except the filename (last element)
+                    relative_dir = '/'.join(relative_path_parts[:-1])
+                    label += rf"\nPath: {relative_dir}"
+
+    return quote(label)
+
+
+# Bits for the standard profile types and the graph flags in graph cache keys
+_PROFILE_TYPE_BITS = {"filament": 1, "machine": 2, "process": 4}
+_USER_ONLY_FLAG = 1
+_GROUP_FLAG = 2
+_SIMPLE_FLAG = 4
+
+
+def _get_graph_cache_key(target_profile: Optional[str], user_only: bool, profile_types: List[str], group: bool, input_dir: str, simple: bool, max_nodes: Optional[int]) -> Tuple:
+    """Build the graph cache key, packing the profile types and flags into integers"""
+    try:
+        types_key = 0
+        for profile_type in profile_types:
+            types_key |= _PROFILE_TYPE_BITS[profile_type]
+    except KeyError:
+        # Other profile types can't be packed, so fall back to the set of types
+        types_key = frozenset(profile_types)
+    flags = (_USER_ONLY_FLAG if user_only else 0) | (_GROUP_FLAG if group else 0) | (_SIMPLE_FLAG if simple else 0)
+    return (target_profile, types_key, flags, input_dir, max_nodes)
+
+
 class GraphVisualizer:
     def __init__(self, analyzer: ProfileAnalyzer):
         self.analyzer = analyzer
+        # Formatted node statements keyed by (file path, group, simple), reused across graphs
+        self._node_cache: Dict[Tuple[str, bool, bool], str] = {}
+        # Directory path components from the system/user level down, keyed by directory path;
+        # they only depend on the path, so they are kept when the profiles are reloaded
+        self._group_path_parts: Dict[str, Tuple[str, ...]] = {}
+        # Generated graphs keyed by the generate_graph arguments
+        self._graph_cache: Dict[Tuple, graphviz.Digraph] = {}
+        self.input_dir: Optional[str] = None
+        self._input_dir_name: Optional[str] = None
+
+    def invalidate(self):
+        """Drop cached graphs and nodes; call after the analyzer's profiles are reloaded"""
+        self._node_cache.clear()
+        self._graph_cache.clear()
     
-    def generate_graph(self, target_profile: Optional[str] = None, user_only: bool = False, profile_types: List[str] = ["filament"], group: bool = False, input_dir: str = "OrcaSlicer", simple: bool = False) -> graphviz.Digraph:
-        """Generate a Graphviz digraph for the profile inheritance"""
-        # Store input_dir for use in _add_profile_node
-        self.input_dir = input_dir
-        if group:
-            dot = graphviz.Digraph(comment='OrcaSlicer Profile Inheritance')
-            dot.attr(rankdir='LR', size='12,10')
-            dot.attr('node', shape='box', style='rounded,filled', fontname='Arial')
-        else:
-            dot = graphviz.Digraph(comment='OrcaSlicer Profile Inheritance')
-            dot.attr(rankdir='LR', size='12,10')
-            dot.attr('node', shape='box', style='rounded,filled', fontname='Arial')
-
-        visited_profiles: set = set()
-
+    def generate_graph(self, target_profile: Optional[str] = None, user_only: bool = False, profile_types: List[str] = ["filament"], group: bool = False, input_dir: str = "OrcaSlicer", simple: bool = False, max_nodes: Optional[int] = None) -> graphviz.Digraph:
+        """
+        Generate a Graphviz digraph for the profile inheritance.
+
+        When max_nodes is set and the graph would have more profiles than that, system profiles
+        (those whose "from" is "system", wherever the file lives) that are not ancestors of a
+        non-system profile are collapsed into summary nodes.
+        """
+        cache_key = _get_graph_cache_key(target_profile, user_only, profile_types, group, input_dir, simple, max_nodes)
+        dot = self._graph_cache.get(cache_key)
+        if dot is None:
+            profiles_to_process, grouped_only_profiles = self._get_profiles_to_process(target_profile, user_only, frozenset(profile_types))
+            dot = self._build_graph(profiles_to_process, grouped_only_profiles, group, input_dir, simple, max_nodes)
+            self._graph_cache[cache_key] = dot
+        # Hand out a copy so callers can add to or save the graph without touching the cached one
+        return dot.copy()
+
+    def generate_graphs(self, profile_types_list: List[List[str]], user_only: bool = False, group: bool = False, input_dir: str = "OrcaSlicer", simple: bool = False, max_nodes: Optional[int] = None) -> Dict[str, graphviz.Digraph]:
+        """
+        Generate a Graphviz digraph for each list of profile types, keyed by the comma-joined types.
+
+        The analyzer's profiles are walked once and shared by all the graphs, and node statements are
+        reused between them.
+        """
+        all_profiles = self.analyzer.get_all_profiles()
+        graphs = {}
+        for profile_types in profile_types_list:
+            cache_key = _get_graph_cache_key(None, user_only, profile_types, group, input_dir, simple, max_nodes)
+            dot = self._graph_cache.get(cache_key)
+            if dot is None:
+                profiles_to_process, grouped_only_profiles = self._get_profiles_to_process(None, user_only, frozenset(profile_types), all_profiles)
+                dot = self._build_graph(profiles_to_process, grouped_only_profiles, group, input_dir, simple, max_nodes)
+                self._graph_cache[cache_key] = dot
+            graphs[','.join(profile_types)] = dot.copy()
+        return graphs
+
+    def iter_dot_lines(self, target_profile: Optional[str] = None, user_only: bool = False, profile_types: List[str] = ["filament"], group: bool = False, input_dir: str = "OrcaSlicer", simple: bool = False, max_nodes: Optional[int] = None) -> Iterator[str]:
+        """
+        Generate the DOT source lines of generate_graph without building a Digraph.
+
+        The profiles are selected before returning, so a missing target raises ValueError here
+        rather than part way through the output.
+        """
+        profiles_to_process, grouped_only_profiles = self._get_profiles_to_process(target_profile, user_only, frozenset(profile_types))
+        body_lines = self._iter_graph_body(profiles_to_process, grouped_only_profiles, group, input_dir, simple, max_nodes)
+        return itertools.chain((f"// {_GRAPH_COMMENT}\n", "digraph {\n"), body_lines, ("}\n",))
+
+    def _get_profiles_to_process(self, target_profile: Optional[str], user_only: bool, profile_types: frozenset, all_profiles: Optional[List[Profile]] = None) -> Tuple[List[Profile], List[Profile]]:
+        """
+        Get the profiles to draw, optionally picking from an already fetched list of all profiles.
+
+        The profiles to draw are all of the requested types. The second list holds profiles of other
+        types that only give their directory a cluster when grouping, and are never drawn.
+        """
+        grouped_only_profiles = []
         if user_only:
             # Only show branches that include user-defined profiles
             relevant_profiles = self.analyzer.get_branches_with_user_profiles(profile_types)
@@ -35,67 +191,80 @@ class GraphVisualizer:
             if not target_profile_obj:
                 raise ValueError(f"Profile '{target_profile}' not found")
 
-            # Only process if the target profile is of a requested type
-            if target_profile_obj.profile_type not in profile_types:
-                # Find if target profile has any ancestors/descendants of the requested type
-                # For now, just add it if it's in the chain even if it's not the right type
-                pass
-
-            # Get the full chain that includes the target profile
+            # Get the full chain that includes the target profile; if none of it or the
+            # descendants is of a requested type, the filter leaves nothing to draw
             target_chain = self.analyzer.get_profile_inheritance_chain(target_profile)
             target_descendants = self.analyzer.get_all_descendants(target_profile)
-            profiles_to_process = [p for p in (target_chain + target_descendants) if p.profile_type in profile_types]
-
-            # Add the target profile even if it's not the right type to maintain inheritance
+            # The chain and descendants can overlap (e.g. through inheritance cycles), so keep each
+            # profile file once
+            seen_paths = set()
+            profiles_to_process = []
+            for p in target_chain + target_descendants:
+                if p.profile_type in profile_types and p.file_path not in seen_paths:
+                    seen_paths.add(p.file_path)
+                    profiles_to_process.append(p)
+
+            # Keep the target profile's directory even if it's not the right type to maintain inheritance
             if target_profile_obj.profile_type not in profile_types:
-                profiles_to_process.append(target_profile_obj)
+                grouped_only_profiles.append(target_profile_obj)
         else:
             # If no target is specified, visualize profiles of the specified types
-            all_profiles = self.analyzer.get_all_profiles()
+            if all_profiles is None:
+                all_profiles = self.analyzer.get_all_profiles()
             profiles_to_process = [p for p in all_profiles if p.profile_type in profile_types]
 
-        # Create profiles mapping by directory - normalize paths to be relative from the base
-        directory_profiles = {}
-        for profile in profiles_to_process:
-            # Extract directory path from file path using Path for OS independence
-            profile_path = Path(profile.file_path)
-            full_path_parts = profile_path.parts
-            # Assuming the base path is up to the first major directory after OrcaSlicer
-            # Find where OrcaSlicer is in the path and take everything after
-            base_index = -1
-            for idx, part in enumerate(full_path_parts):
-                if part == 'OrcaSlicer':
-                    base_index = idx
-                    break
+        return profiles_to_process, grouped_only_profiles
 
-            # Use the path starting after OrcaSlicer
-            if base_index != -1:
-                directory_parts = full_path_parts[base_index:]
-                directory_path = '/' + '/'.join(directory_parts[:-1])  # Exclude the filename
-            else:
-                # Fallback: just remove the file name using parent
-                directory_path = '/'.join(profile_path.parent.parts)
+    def _build_graph(self, profiles_to_process: List[Profile], grouped_only_profiles: List[Profile], group: bool, input_dir: str, simple: bool, max_nodes: Optional[int]) -> graphviz.Digraph:
+        """Build a new Graphviz digraph for the profile inheritance"""
+        dot = graphviz.Digraph(comment=_GRAPH_COMMENT)
+        dot.body.extend(self._iter_graph_body(profiles_to_process, grouped_only_profiles, group, input_dir, simple, max_nodes))
+        return dot
+
+    def _iter_graph_body(self, profiles_to_process: List[Profile], grouped_only_profiles: List[Profile], group: bool, input_dir: str, simple: bool, max_nodes: Optional[int]) -> Iterator[str]:
+        """Generate the DOT statement lines of the graph body for the profiles"""
+        # Store input_dir for use in _add_profile_node; labels include paths relative to it
+        if input_dir != self.input_dir:
+            self._node_cache.clear()
+            # Labels locate the input directory by its name within each profile path
+            self._input_dir_name = Path(input_dir).name
+        self.input_dir = input_dir
+        yield from _GRAPH_HEADER_LINES
 
-            if directory_path not in directory_profiles:
-                directory_profiles[directory_path] = []
-            directory_profiles[directory_path].append(profile)
+        # Collapse branches of large graphs that hold only system profiles into summary nodes
+        collapsed_groups = []
+        if max_nodes is not None and len(profiles_to_process) > max_nodes:
+            profiles_to_process, collapsed_groups = self._collapse_system_profiles(profiles_to_process)
 
         if group:
+            # Create profiles mapping by directory - normalize paths to be relative from the base;
+            # the analyzer works out each profile's directory once and keeps it between graphs
+            profile_directories = self.analyzer.get_profile_directories()
+            directory_profiles = defaultdict(list)
+            for profile in profiles_to_process:
+                directory_profiles[profile_directories[profile.file_path]].append(profile)
+            for profile in grouped_only_profiles:
+                # Only make sure the directory has a cluster
+                directory_profiles[profile_directories[profile.file_path]]
+
+            # Edges between profiles in the same directory are declared inside that directory's
+            # cluster, which keeps dot's layout constraints local; the rest go at the top level
+            cluster_edges = defaultdict(list)
+            cross_cluster_edges = []
+            for parent_profile, child_profile in self._get_inheritance_edges(profiles_to_process):
+                child_directory = profile_directories[child_profile.file_path]
+                if profile_directories[parent_profile.file_path] == child_directory:
+                    cluster_edges[child_directory].append((parent_profile, child_profile))
+                else:
+                    cross_cluster_edges.append((parent_profile, child_profile))
+
             # Build the directory hierarchy tree based on the existing directory paths
-            # but starting the groupings at the 'system' and 'user' levels
+            # but starting the groupings at the 'system' and 'user' levels, along with a mapping
+            # from the simplified paths (starting from system/user) to the full directory paths
             root = {}
-            for directory_path in directory_profiles.keys():
-                path_parts = [part for part in directory_path.split('/') if part]
-
-                # Find index of 'system' or 'user' to start grouping from there
-                start_idx = 0
-                for i, part in enumerate(path_parts):
-                    if part in ['system', 'user']:
-                        start_idx = i
-                        break
-
-                # Create path from system/user onwards
-                relevant_parts = path_parts[start_idx:] if start_idx > 0 else path_parts
+            path_mapping = {}
+            for full_path in directory_profiles.keys():
+                relevant_parts = self._get_group_path_parts(full_path)
 
                 # Add the sub-hierarchy starting from the relevant level
                 current = root
@@ -104,153 +273,198 @@ class GraphVisualizer:
                         current[part] = {}
                     current = current[part]
 
-            # Create a mapping from simplified paths (starting from system/user) to the full directory paths
-            path_mapping = {}
-            for full_path in directory_profiles.keys():
-                path_parts = [part for part in full_path.split('/') if part]
-
-                # Find index of 'system' or 'user' to start grouping from there
-                start_idx = 0
-                for i, part in enumerate(path_parts):
-                    if part in ['system', 'user']:
-                        start_idx = i
-                        break
-
-                # Create path from system/user onwards
-                relevant_parts = path_parts[start_idx:] if start_idx > 0 else path_parts
                 simplified_path = '/' + '/'.join(relevant_parts) if relevant_parts else '/'
                 path_mapping[simplified_path] = full_path
 
-            # Recursive function to create nested subgraphs
-            def create_nested_subgraphs_recursive(hierarchy_node, path_list, parent_graph):
-                current_path = '/' + '/'.join(path_list) if path_list else '/'
-
-                # Process each directory at this level
-                for dir_name, sub_hierarchy in hierarchy_node.items():
-                    child_tree_path = current_path + '/' + dir_name if path_list else '/' + dir_name if dir_name else '/'
-
-                    # Create subgraph for this directory
-                    subgraph_name = child_tree_path.replace('/', '_').replace('-', '_').replace(' ', '_').replace('(', '').replace(')', '')
-                    subgraph = graphviz.Digraph(f'cluster_{subgraph_name}')
-                    subgraph.attr(label=dir_name)
-                    subgraph.attr(style='bold', color='lightgrey', penwidth='2')
+            # Create nested subgraphs structure starting from system/user level, walking the
+            # hierarchy with an explicit stack of (remaining directories, simplified path, indent)
+            # entries instead of recursing; each level is indented one more tab
+            stack = [(iter(root.items()), '', '\t')]
+            while stack:
+                entries, current_path, indent = stack[-1]
+                for dir_name, sub_hierarchy in entries:
+                    child_tree_path = current_path + '/' + dir_name
+
+                    # Open the subgraph for this directory
+                    subgraph_name = child_tree_path.translate(_SUBGRAPH_NAME_TRANSLATION)
+                    yield f"{indent}subgraph {quote(f'cluster_{subgraph_name}')} {{\n"
+                    yield f"{indent}\tlabel={quote(dir_name)}\n"
+                    yield f"{indent}\t{_CLUSTER_ATTRIBUTES}\n"
 
                     # Check if this simplified path corresponds to an actual directory path
                     if child_tree_path in path_mapping and path_mapping[child_tree_path] in directory_profiles:
                         actual_path = path_mapping[child_tree_path]
                         for profile in directory_profiles[actual_path]:
-                            if profile.profile_type in profile_types:
-                                self._add_profile_node(subgraph, profile, group=True, simple=simple)
+                            yield f"{indent}\t{self._format_profile_node(profile, True, simple)}\n"
+                        for parent_profile, child_profile in cluster_edges[actual_path]:
+                            yield f"{indent}\t{self._format_inheritance_edge(parent_profile, child_profile)}\n"
 
-                    # Recursively process subdirectories within this subgraph
-                    if sub_hierarchy:  # Only recurse if there are subdirectories
-                        create_nested_subgraphs_recursive(sub_hierarchy, path_list + [dir_name], subgraph)
-
-                    # Add this subgraph to the parent graph
-                    parent_graph.subgraph(subgraph)
-
-            # Create nested subgraphs structure starting from system/user level
-            create_nested_subgraphs_recursive(root, [], dot)
+                    # Process the subdirectories within this subgraph before its next sibling
+                    stack.append((iter(sub_hierarchy.items()), child_tree_path, indent + '\t'))
+                    break
+                else:
+                    stack.pop()
+                    if stack:
+                        # All subdirectories are done, so close the subgraph that contains them
+                        yield f"{indent[:-1]}}}\n"
 
             # Add inheritance relationships between profiles (across subgraphs)
-            for profile in profiles_to_process:
-                if profile.profile_type in profile_types and profile.inherits:
-                    parent_profile = self.analyzer.get_profile(profile.inherits, profile.file_path)
-                    if parent_profile and parent_profile.profile_type in profile_types and parent_profile in profiles_to_process:
-                        self._add_inheritance_edge(dot, parent_profile, profile)
+            for parent_profile, child_profile in cross_cluster_edges:
+                yield f"\t{self._format_inheritance_edge(parent_profile, child_profile)}\n"
         else:
             # Add profiles without grouping
             for profile in profiles_to_process:
-                if profile.profile_type in profile_types:
-                    self._add_profile_node(dot, profile, group=group, simple=simple)
+                yield f"\t{self._format_profile_node(profile, group, simple)}\n"
 
             # Add inheritance relationships for all processed profiles
-            for profile in profiles_to_process:
-                if profile.profile_type in profile_types and profile.inherits:
-                    parent_profile = self.analyzer.get_profile(profile.inherits, profile.file_path)
-                    if parent_profile and parent_profile.profile_type in profile_types and parent_profile in profiles_to_process:
-                        self._add_inheritance_edge(dot, parent_profile, profile)
+            for parent_profile, child_profile in self._get_inheritance_edges(profiles_to_process):
+                yield f"\t{self._format_inheritance_edge(parent_profile, child_profile)}\n"
+
+        for anchor, profile_type, count in collapsed_groups:
+            for statement in self._format_collapsed_node(anchor, profile_type, count):
+                yield f"\t{statement}\n"
+
+    def _get_group_path_parts(self, directory_path: str) -> Tuple[str, ...]:
+        """Get the components of a directory path from the system/user level down, cached between graphs"""
+        relevant_parts = self._group_path_parts.get(directory_path)
+        if relevant_parts is None:
+            path_parts = [part for part in directory_path.split('/') if part]
+
+            # Find index of 'system' or 'user' to start grouping from there
+            start_idx = 0
+            for i, part in enumerate(path_parts):
+                if part in _GROUP_ROOTS:
+                    start_idx = i
+                    break
 
-        return dot
+            # Create path from system/user onwards
+            relevant_parts = tuple(path_parts[start_idx:])
+            self._group_path_parts[directory_path] = relevant_parts
+        return relevant_parts
+
+    def _collapse_system_profiles(self, profiles: List[Profile]) -> Tuple[List[Profile], List[Tuple[Optional[Profile], str, int]]]:
+        """
+        Split graph profiles into those to draw and collapsed system profiles.
+
+        A profile is a system profile when its "from" is "system" (Profile.from_system), whichever
+        directory its file is in. Non-system profiles and their ancestors are kept. Every other
+        profile is counted under its nearest kept ancestor (or under no anchor if it has none),
+        grouped by profile type. Returns the kept profiles in their original order and the
+        (anchor, profile type, count) summary groups.
+        """
+        profiles_by_path = {profile.file_path: profile for profile in profiles}
+
+        def get_graph_parent(profile: Profile) -> Optional[Profile]:
+            """Get the resolved parent of a profile if it is part of the graph"""
+            if not profile.inherits:
+                return None
+            parent = self.analyzer.get_profile(profile.inherits, profile.file_path)
+            return profiles_by_path.get(parent.file_path) if parent else None
+
+        # Keep every non-system profile and its chain of ancestors within the graph
+        kept_paths = set()
+        for profile in profiles:
+            if profile.from_system:
+                continue
+            current = profile
+            while current is not None and current.file_path not in kept_paths:
+                kept_paths.add(current.file_path)
+                current = get_graph_parent(current)
+
+        # Count the remaining profiles under their nearest kept ancestor, in first-seen order
+        counts: Dict[Tuple[Optional[str], str], int] = {}
+        for profile in profiles:
+            if profile.file_path in kept_paths:
+                continue
+            anchor_path = None
+            seen_paths = {profile.file_path}
+            current = get_graph_parent(profile)
+            while current is not None and current.file_path not in seen_paths:
+                if current.file_path in kept_paths:
+                    anchor_path = current.file_path
+                    break
+                seen_paths.add(current.file_path)
+                current = get_graph_parent(current)
+            key = (anchor_path, profile.profile_type)
+            counts[key] = counts.get(key, 0) + 1
+
+        kept_profiles = [profile for profile in profiles if profile.file_path in kept_paths]
+        collapsed_groups = [(profiles_by_path[anchor_path] if anchor_path else None, profile_type, count)
+                            for (anchor_path, profile_type), count in counts.items()]
+        return kept_profiles, collapsed_groups
+
+    def _format_collapsed_node(self, anchor: Optional[Profile], profile_type: str, count: int) -> List[str]:
+        """Format the statements for a summary node of collapsed system profiles, linked from their nearest drawn ancestor"""
+        color, system_fillcolor, _ = _PROFILE_TYPE_STYLES.get(profile_type, _DEFAULT_PROFILE_STYLE)
+        anchor_id = self._get_node_id(anchor) if anchor else None
+        node_id = f"{anchor_id or 'system'}__collapsed_{profile_type}"
+        node_attributes = attr_list(f"+{count} system {profile_type} profiles",
+                                    kwargs={'fillcolor': system_fillcolor, 'color': color, 'penwidth': '1',
+                                            'shape': 'box', 'style': 'rounded,filled,dashed'})
+        statements = [f"{quote(node_id)}{node_attributes}"]
+        if anchor_id:
+            statements.append(f"{quote_edge(anchor_id)} -> {quote_edge(node_id)} [arrowhead=vee style=dashed]")
+        return statements
     
     def _add_profile_node(self, dot: graphviz.Digraph, profile: Profile, group: bool = False, simple: bool = False):
         """Add a profile node to the graph"""
-        # Create a label with profile name and key information
-        label_parts = [profile.name]  # Profile name without bolding
-
-        # Add additional information only if not in simple mode
-        if not simple:
-            # Add vendor if available
-            vendor = profile.settings.get('filament_vendor')
-            if vendor and isinstance(vendor, list) and len(vendor) > 0:
-                label_parts.append(f"Vendor: {vendor[0]}")
-
-            # Get just the filename without the parent directory
-            profile_path = Path(profile.file_path)
-            filename = profile_path.name
-            label_parts.append(f"File: {filename}")
-
-            # Add the path within the input directory when not using group option
-            if not group:
-                # Extract the path relative to the input directory
-                # Find the input directory in the path and get everything after it
-                path_parts = profile_path.parts
-                input_dir_path = Path(self.input_dir)
-                input_dir_name = input_dir_path.name
-                input_dir_idx = -1
-                for i, part in enumerate(path_parts):
-                    if part == input_dir_name:
-                        input_dir_idx = i
-                        break
-
-                if input_dir_idx >= 0:
-                    # Get everything after the input directory name
-                    relative_path_parts = path_parts[input_dir_idx + 1:]  # Skip input directory itself
-                    if len(relative_path_parts) > 1:  # If we have subdirectories
-                        # Join all parts except the filename (last element)
-                        relative_dir = '/'.join(relative_path_parts[:-1])
-                        label_parts.append(f"Path: {relative_dir}")
-
-        label = r'\n'.join(label_parts)
-
-        # Determine if profile is from system or user directory based on file path
-        is_user_profile = "user/" in profile.file_path
-
-        # Set colors based on OrcaSlicer application theme with same border color for type regardless of system/user
-        if profile.profile_type == "filament":
-            color = '#2E86AB'  # Darker blue for filament type
-            # Use transparency: 25% for system (lighter), 50% for user (darker)
-            fillcolor = '#2E86AB33' if not is_user_profile else '#2E86AB80'  # 33 = ~20%, 80 = ~50%
-        elif profile.profile_type == "machine":
-            color = '#27AE60'  # Darker green for machine type
-            fillcolor = '#27AE6033' if not is_user_profile else '#27AE6080'  # 33 = ~20%, 80 = ~50%
-        elif profile.profile_type == "process":
-            color = '#8E44AD'  # Dark purple for process type
-            fillcolor = '#8E44AD33' if not is_user_profile else '#8E44AD80'  # 33 = ~20%, 80 = ~50%
-        else:
-            # Default color for unknown types
-            color = '#7F8C8D'  # Gray for other types
-            fillcolor = '#7F8C8D33' if not is_user_profile else '#7F8C8D80'  # 33 = ~20%, 80 = ~50%
-
-        # Apply thicker border for user profiles (under user directory)
-        penwidth = '3' if is_user_profile else '1'
+        dot.body.append(f"\t{self._format_profile_node(profile, group, simple)}\n")
+
+    def _format_profile_node(self, profile: Profile, group: bool, simple: bool) -> str:
+        """Format the DOT node statement for a profile"""
+        node_key = (profile.file_path, group, simple)
+        statement = self._node_cache.get(node_key)
+        if statement is None:
+            statement = self._build_node_statement(profile, _get_node_label(profile, group, simple, self._input_dir_name))
+            self._node_cache[node_key] = statement
+        return statement
+
+    def _build_node_statement(self, profile: Profile, label: str) -> str:
+        """Build the DOT node statement for a profile with its quoted label"""
+        # The statement is formatted directly; Digraph.node would quote and sort the same
+        # constant attributes again for every node
+
+        # Set colors based on OrcaSlicer application theme with same border color for type regardless of system/user,
+        # with a darker fill and thicker border for profiles from the user directory
+        system_attributes, user_attributes = _PROFILE_TYPE_NODE_ATTRIBUTES.get(profile.profile_type, _DEFAULT_NODE_ATTRIBUTES)
+        attributes = user_attributes if profile.is_in_user_directory else system_attributes
 
         # Create unique node ID to handle duplicate profile names in different directories
-        node_id = f"{profile.name}__{Path(profile.file_path).parent.name}__{hash(profile.file_path) % 10000}"
+        node_id = quote(self._get_node_id(profile))
 
         # Use rounded boxes for all profile types (instead of shape-based shapes)
-        dot.node(node_id, label=label, fillcolor=fillcolor, color=color, penwidth=penwidth, shape='box', style='rounded,filled')
-    
+        return f"{node_id} [label={label} {attributes}]"
+
     def _get_node_id(self, profile: Profile) -> str:
         """Generate a unique node ID for a profile"""
-        return f"{profile.name}__{Path(profile.file_path).parent.name}__{hash(profile.file_path) % 10000}"
+        # Profiles always sit in a directory below the input directory, so the parent's name is
+        # the second to last path component
+        return f"{profile.name}__{profile.file_path_parts[-2]}__{hash(profile.file_path) % 10000}"
 
     def _add_inheritance_edge(self, dot: graphviz.Digraph, parent_profile: Profile, child_profile: Profile):
         """Add an inheritance edge from parent to child using unique node IDs"""
-        parent_node_id = self._get_node_id(parent_profile)
-        child_node_id = self._get_node_id(child_profile)
-        dot.edge(parent_node_id, child_node_id, arrowhead='vee')
+        dot.body.append(f"\t{self._format_inheritance_edge(parent_profile, child_profile)}\n")
+
+    def _format_inheritance_edge(self, parent_profile: Profile, child_profile: Profile) -> str:
+        """Format the DOT edge statement from parent to child using unique node IDs"""
+        parent_node_id = quote_edge(self._get_node_id(parent_profile))
+        child_node_id = quote_edge(self._get_node_id(child_profile))
+        return f"{parent_node_id} -> {child_node_id} [arrowhead=vee]"
     
+    def _get_inheritance_edges(self, profiles: List[Profile]) -> List[Tuple[Profile, Profile]]:
+        """Get the (parent, child) pairs for each profile whose parent is also in the graph"""
+        # Profiles are unique by file path, so test membership against a set of paths
+        # instead of scanning the profile list for every edge. The profiles are all of the
+        # requested types, so a parent in the set is too
+        profile_paths = {profile.file_path for profile in profiles}
+        edges = []
+        for profile in profiles:
+            if profile.inherits:
+                parent_profile = self.analyzer.get_profile(profile.inherits, profile.file_path)
+                if parent_profile and parent_profile.file_path in profile_paths:
+                    edges.append((parent_profile, profile))
+        return edges
+
     def _add_inheritance_chain(self, dot: graphviz.Digraph, profile: Profile, visited: set):
         """Add all parent profiles in the inheritance chain"""
         current = profile
@@ -0,0 +1,35 @@
+import json
+
+from orcaslice_profile_explorer.profile_analyzer import ProfileAnalyzer
+from orcaslice_profile_explorer.visualizer import GraphVisualizer
+
+
+def _write_profile(path, name, inherits=None, source="system"):
+    data = {"type": "filament", "name": name, "from": source}
+    if inherits:
+        data["inherits"] = inherits
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(data))
+
+
+def test_collapse_system_keeps_profiles_by_from_field(tmp_path):
+    base = tmp_path / "OrcaSlicer"
+    system_dir = base / "system" / "Vendor" / "filament"
+    user_dir = base / "user" / "default" / "filament"
+    _write_profile(system_dir / "base.json", "Base PLA")
+    _write_profile(system_dir / "used.json", "Used PLA", "Base PLA")
+    _write_profile(system_dir / "unused.json", "Unused PLA", "Base PLA")
+    # Not from the system, but not a user profile either, and under the system directory
+    _write_profile(system_dir / "imported.json", "Imported PLA", "Base PLA", source="Default")
+    _write_profile(user_dir / "mine.json", "My PLA", "Used PLA", source="User")
+    # A vendor profile copied into the user directory is still a system profile
+    _write_profile(user_dir / "vendor copy.json", "Vendor Copy PLA", "Base PLA")
+
+    analyzer = ProfileAnalyzer(str(base))
+    source = GraphVisualizer(analyzer).generate_graph(input_dir=str(base), max_nodes=1).source
+
+    for kept in ("Base PLA", "Used PLA", "Imported PLA", "My PLA"):
+        assert kept in source
+    for collapsed in ("Unused PLA", "Vendor Copy PLA"):
+        assert collapsed not in source
+    assert "+2 system filament profiles" in source